@@ -2,226 +2,458 @@ import streamlit as st
 import os
 import requests
 import time
+import asyncio
 import base64
-import json
+import contextlib
+import io
+import math
+import orjson
+import re
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from dotenv import load_dotenv
-import gspread
-from google.oauth2.service_account import Credentials
+from hashlib import blake2b
+from types import MappingProxyType
+from awarri_http import make_awarri_adapter
+from tts_cache import read_tts_cache, write_tts_cache
 
-# Load environment variables
+# Load environment variables from .env; variables already set in the environment win
+from dotenv import load_dotenv
 load_dotenv()
 
-# Language mapping
-AWARRI_LANGUAGE_MAPPING = {
-    "hausa": "Hausa",
-    "english": "English"
-}
+# Language mapping, with common casings precomputed so lookups skip lower()
+AWARRI_LANGUAGE_MAPPING = MappingProxyType({
+    variant: awarri_name
+    for key, awarri_name in {"hausa": "Hausa", "english": "English"}.items()
+    for variant in (key, key.title(), key.upper())
+})
+
+# (connect, read) seconds: fail fast on unreachable hosts, allow slow inference
+AWARRI_TIMEOUT = (5, 55)
+
+ASR_URL = "https://dev.langeasyllm.com/v1/asr/transcribe"
+ASR_SAMPLE_RATE = 16000
+ASR_FRAME_BYTES = 640  # 20 ms of 16 kHz mono int16 PCM
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """Endpoints, API keys and sheet ID resolved once per process"""
+    tts_url: str | None
+    tts_api_key: str | None
+    asr_api_key: str | None
+    asr_stream_url: str | None
+    asr_multipart: bool
+    sheet_id: str | None
+
+def read_sheet_id():
+    """Sheet ID from secrets first (for deployment), then env (for local)"""
+    # Checking for a secrets file first avoids st.secrets drawing a "no secrets" error
+    sheet_id = st.secrets.get("GOOGLE_SHEET_ID") if st.secrets.load_if_toml_exists() else None
+    return sheet_id or os.getenv("GOOGLE_SHEET_ID")
+
+@st.cache_resource
+def get_config():
+    """Snapshot the environment and secrets instead of reading them per request"""
+    return AppConfig(
+        tts_url=os.getenv("AWARRI_TTS_URL"),
+        tts_api_key=os.getenv("AWARRI_API_KEY"),
+        asr_api_key=os.getenv("AWARRI_NEW_API_KEY"),
+        asr_stream_url=os.getenv("AWARRI_ASR_STREAM_URL"),
+        asr_multipart=os.getenv("AWARRI_MULTIPART") == "1",
+        sheet_id=read_sheet_id()
+    )
+
+@st.cache_resource
+def awarri_headers():
+    """Request headers for the ASR and TTS endpoints, built once from the config"""
+    config = get_config()
+    return {
+        'asr': {
+            "x-api-key": config.asr_api_key,
+        },
+        'tts': {
+            "x-api-key": config.tts_api_key,
+            "Content-Type": "application/json",
+            "Accept": "audio/wav"
+        }
+    }
 
 # Google Sheets setup
 SCOPES = [
-    'https://www.googleapis.com/auth/spreadsheets',
-    'https://www.googleapis.com/auth/drive'
+    'https://www.googleapis.com/auth/spreadsheets'
 ]
 
 @st.cache_resource
 def get_google_sheets_client():
     """Initialize Google Sheets client"""
+    # Imported here so sessions that never submit skip the import cost
+    import gspread
+    from google.oauth2.service_account import Credentials
+
     try:
         # Try to load from Streamlit secrets first (for deployment)
-        if hasattr(st, 'secrets') and "GOOGLE_SHEETS_CREDENTIALS" in st.secrets:
-            creds_dict = dict(st.secrets["GOOGLE_SHEETS_CREDENTIALS"])
+        if st.secrets.load_if_toml_exists() and "GOOGLE_SHEETS_CREDENTIALS" in st.secrets:
+            creds_info = st.secrets["GOOGLE_SHEETS_CREDENTIALS"]
         else:
             # Fallback to environment variable (for local development)
             creds_json = os.getenv("GOOGLE_SHEETS_CREDENTIALS")
             if not creds_json:
                 st.error("Google Sheets credentials not found")
                 return None
-            creds_dict = json.loads(creds_json)
+            creds_info = orjson.loads(creds_json)
         
-        creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+        creds = Credentials.from_service_account_info(creds_info, scopes=SCOPES)
         client = gspread.authorize(creds)
         return client
     except Exception as e:
         st.error(f"Failed to initialize Google Sheets: {str(e)}")
         return None
 
+SHEET_HEADERS = [
+    'Timestamp',
+    'User Name',
+    'Naturalness Score',
+    'Accuracy Score',
+    'Pronouncing Numbers Score',
+    'Pronouncing MTN Lingo Score',
+    'Overall Comment'
+]
+
+@st.cache_resource(ttl="1h")
+def get_worksheet(sheet_id):
+    """Open the evaluation worksheet, reused across submissions"""
+    return get_google_sheets_client().open_by_key(sheet_id).sheet1
+
+@st.cache_resource
+def ensure_headers(sheet_id):
+    """Write the header row once per process if the sheet is empty"""
+    worksheet = get_worksheet(sheet_id)
+    if not worksheet.row_values(1):
+        worksheet.append_row(SHEET_HEADERS)
+    return True
+
 def save_to_google_sheets(data):
     """Save evaluation data to Google Sheets"""
+    # Keep only the latest evaluation queued: an edited resubmit supersedes the failed one
+    st.session_state._pending_rows = [[data[header] for header in SHEET_HEADERS]]
+
     try:
-        client = get_google_sheets_client()
-        if not client:
-            return False
-        
-        # Try to get Sheet ID from secrets first (for deployment), then env (for local)
-        sheet_id = st.secrets.get("GOOGLE_SHEET_ID") if hasattr(st, 'secrets') else os.getenv("GOOGLE_SHEET_ID")
+        # Check the Sheet ID first so credentials are only built when they can be used
+        sheet_id = get_config().sheet_id
         if not sheet_id:
             st.error("Google Sheet ID not found")
             return False
         
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.sheet1
+        client = get_google_sheets_client()
+        if not client:
+            return False
         
-        # Check if headers exist, if not add them
-        try:
-            headers = worksheet.row_values(1)
-            if not headers:
-                raise Exception("No headers")
-        except:
-            headers = [
-                'Timestamp',
-                'User Name',
-                'Naturalness Score',
-                'Accuracy Score',
-                'Pronouncing Numbers Score',
-                'Pronouncing MTN Lingo Score',
-                'Overall Comment'
-            ]
-            worksheet.append_row(headers)
+        ensure_headers(sheet_id)
+        worksheet = get_worksheet(sheet_id)
         
-        # Append data
-        row = [
-            data['Timestamp'],
-            data['User Name'],
-            data['Naturalness Score'],
-            data['Accuracy Score'],
-            data['Pronouncing Numbers Score'],
-            data['Pronouncing MTN Lingo Score'],
-            data['Overall Comment']
-        ]
-        worksheet.append_row(row)
+        # Flush the pending row, retried here if an earlier submit failed
+        worksheet.append_rows(
+            st.session_state._pending_rows,
+            value_input_option='RAW',
+            insert_data_option='INSERT_ROWS'
+        )
+        st.session_state._pending_rows = []
         return True
         
     except Exception as e:
         st.error(f"Failed to save to Google Sheets: {str(e)}")
         return False
 
+@st.cache_resource
+def awarri_session():
+    """Shared HTTP session so Awarri calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    session.mount('https://', make_awarri_adapter(pool_connections=10, pool_maxsize=20))
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+@st.cache_resource
+def asr_upload_mode():
+    """Process-wide record of which ASR upload paths are enabled and accepted by the server"""
+    config = get_config()
+    return {
+        'multipart': config.asr_multipart,
+        'stream': bool(config.asr_stream_url)
+    }
+
+AUDIO_DATA_URI_PREFIX = "data:audio/wav;base64,"
+
 def encode_audio_to_base64_uri(audio_bytes):
     """Encode audio bytes to base64 data URI"""
-    base64_audio = base64.b64encode(audio_bytes).decode('utf-8')
-    return f"data:audio/wav;base64,{base64_audio}"
+    return AUDIO_DATA_URI_PREFIX + base64.b64encode(audio_bytes).decode('ascii')
+
+def convert_audio_for_asr(audio_bytes):
+    """Downmix and resample audio to 16 kHz mono PCM16 WAV before upload"""
+    import numpy as np
+    import soundfile as sf
+    from scipy.signal import resample_poly
 
-def transcribe_with_awarri_new(audio_bytes, language):
-    """Transcribe audio using new Awarri API"""
     try:
-        base64_data_uri = encode_audio_to_base64_uri(audio_bytes)
-        
+        info = sf.info(io.BytesIO(audio_bytes))
+        if info.format == 'WAV' and info.samplerate == ASR_SAMPLE_RATE and info.channels == 1 and info.subtype == 'PCM_16':
+            return audio_bytes
+        samples, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype='float32', always_2d=True)
+    except RuntimeError:
+        # Formats libsndfile cannot decode are sent unchanged
+        return audio_bytes
+
+    mono = samples.mean(axis=1)
+    if sample_rate != ASR_SAMPLE_RATE:
+        divisor = math.gcd(sample_rate, ASR_SAMPLE_RATE)
+        mono = resample_poly(mono, ASR_SAMPLE_RATE // divisor, sample_rate // divisor)
+
+    buffer = io.BytesIO()
+    sf.write(buffer, np.clip(mono, -1.0, 1.0), ASR_SAMPLE_RATE, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+def request_transcription(audio_bytes, language):
+    """Call the Awarri ASR endpoint; failures raise for transcribe_with_awarri_new to report"""
+    awarri_language = AWARRI_LANGUAGE_MAPPING.get(language, "English")
+    headers = awarri_headers()['asr']
+    upload_mode = asr_upload_mode()
+    audio_bytes = convert_audio_for_asr(audio_bytes)
+    
+    start_time = time.time()
+    response = None
+    if upload_mode['multipart']:
+        # Raw WAV upload avoids the 33% base64 overhead
+        response = awarri_session().post(
+            ASR_URL,
+            files={'audio': ('rec.wav', audio_bytes, 'audio/wav')},
+            data={'language': awarri_language},
+            headers=headers,
+            timeout=AWARRI_TIMEOUT
+        )
+        if response.status_code == 415:
+            upload_mode['multipart'] = False
+            response = None
+    
+    if response is None:
         payload = {
-            "base64Data": base64_data_uri,
-            "language": AWARRI_LANGUAGE_MAPPING.get(language.lower(), "English")
+            "base64Data": encode_audio_to_base64_uri(audio_bytes),
+            "language": awarri_language
         }
-        
-        headers = {
-            "x-api-key": os.getenv("AWARRI_NEW_API_KEY"),
-            "Content-Type": "application/json",
-        }
-        
-        start_time = time.time()
-        response = requests.post(
-            "https://dev.langeasyllm.com/v1/asr/transcribe",
+        response = awarri_session().post(
+            ASR_URL,
             json=payload,
             headers=headers,
-            timeout=60
+            timeout=AWARRI_TIMEOUT
         )
-        response.raise_for_status()
-        latency = time.time() - start_time
-        
-        response_data = response.json()
-        transcription = response_data.get("text", "")
-        
+    response.raise_for_status()
+    latency = time.time() - start_time
+    
+    response_data = orjson.loads(response.content)
+    transcription = response_data.get("text", "")
+    
+    return {
+        'transcription': transcription,
+        'latency': round(latency, 2),
+        'status': 'success',
+        'http_status': response.status_code
+    }
+
+def transcribe_with_awarri_new(audio_bytes, language):
+    """Transcribe audio using new Awarri API"""
+    if not get_config().asr_api_key:
         return {
-            'transcription': transcription,
-            'latency': round(latency, 2),
-            'status': 'success'
+            'transcription': '',
+            'latency': 0.0,
+            'status': 'error',
+            'http_status': None,
+            'error': "Awarri ASR API key not configured"
         }
-        
-    except Exception as e:
+    
+    try:
+        return request_transcription(audio_bytes, language)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        response = getattr(e, 'response', None)
         return {
-            'transcription': f"Error: {str(e)}",
+            'transcription': '',
             'latency': 0.0,
-            'status': 'error'
+            'status': 'error',
+            'http_status': response.status_code if response is not None else None,
+            'error': str(e)
         }
 
-def generate_awarri_audio(text: str):
-    """
-    Generate audio using the new Awarri TTS endpoint.
-    Uses returnFormat='audio' (raw WAV bytes).
-    Returns (audio_base64, latency)
-    """
-    url = os.getenv("AWARRI_TTS_URL")
-    api_key = os.getenv("AWARRI_API_KEY")
+def transcribe_batch(items):
+    """Transcribe (audio_bytes, language) pairs concurrently over the shared session"""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(lambda item: transcribe_with_awarri_new(*item), items))
 
-    if not url or not api_key:
-        st.error("Awarri API credentials not configured")
-        return None, 0.0
+async def stream_transcription(audio_bytes, language, on_partial):
+    """Push 20 ms PCM frames over the streaming ASR socket, reporting partial transcripts; None if nothing was finalised"""
+    import aiohttp
+
+    with wave.open(io.BytesIO(convert_audio_for_asr(audio_bytes))) as wav:
+        pcm = wav.readframes(wav.getnframes())
+
+    headers = awarri_headers()['asr']
+    params = {
+        "language": AWARRI_LANGUAGE_MAPPING.get(language, "English"),
+        "encoding": "linear16",
+        "sample_rate": ASR_SAMPLE_RATE
+    }
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async with session.ws_connect(
+            get_config().asr_stream_url,
+            params=params,
+            timeout=60,
+            # Bound the wait for each message so a silent server cannot hang the script
+            receive_timeout=AWARRI_TIMEOUT[1]
+        ) as ws:
+            async def send_frames():
+                for offset in range(0, len(pcm), ASR_FRAME_BYTES):
+                    await ws.send_bytes(pcm[offset:offset + ASR_FRAME_BYTES])
+                await ws.send_json({"type": "CloseStream"})
+
+            sender = asyncio.create_task(send_frames())
+            final_segments = []
+            try:
+                async for message in ws:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    result = orjson.loads(message.data)
+                    text = result.get("text", "")
+                    if result.get("is_final"):
+                        final_segments.append(text)
+                        on_partial(" ".join(final_segments))
+                    else:
+                        on_partial(" ".join(final_segments + [text]))
+            finally:
+                # Stop sending once the socket is done; re-raises any send error
+                sender.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await sender
+
+    # A socket that closed before any final result is not a transcript; let the caller fall back
+    if not final_segments:
+        return None
+    return " ".join(final_segments)
+
+def transcribe_streaming(audio_bytes, language, on_partial):
+    """Transcribe over the streaming endpoint when configured, else the blocking POST"""
+    upload_mode = asr_upload_mode()
+    # The blocking path reports a missing API key; aiohttp cannot send a None header
+    if not upload_mode['stream'] or not get_config().asr_api_key:
+        return transcribe_with_awarri_new(audio_bytes, language)
+
+    import aiohttp
+
+    try:
+        start_time = time.time()
+        transcription = asyncio.run(stream_transcription(audio_bytes, language, on_partial))
+        latency = time.time() - start_time
+    except aiohttp.WSServerHandshakeError as e:
+        # The server does not offer streaming here; stop probing for this process
+        if e.status in (404, 415):
+            upload_mode['stream'] = False
+        return transcribe_with_awarri_new(audio_bytes, language)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionResetError, wave.Error, orjson.JSONDecodeError):
+        return transcribe_with_awarri_new(audio_bytes, language)
 
-    headers = {
-        "x-api-key": api_key,
-        "Content-Type": "application/json",
-        "Accept": "audio/wav"
+    if transcription is None:
+        return transcribe_with_awarri_new(audio_bytes, language)
+
+    return {
+        'transcription': transcription,
+        'latency': round(latency, 2),
+        'status': 'success',
+        'http_status': None
     }
 
+def request_awarri_audio(text, use_cache=True):
+    """
+    Call the Awarri TTS endpoint unless the audio is already in the disk cache.
+    Returns (audio_bytes, latency, from_cache); failures raise so they are never cached.
+    """
+    tts_url = get_config().tts_url
+    if use_cache:
+        cached_audio = read_tts_cache(text, tts_url)
+        if cached_audio is not None:
+            return cached_audio, 0.0, True
+
     payload = {
         "text": text,
         "language": "Hausa",
         "returnFormat": "audio"
     }
 
-    try:
-        start_time = time.time()
-        response = requests.post(
-            url,
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        latency = time.time() - start_time
+    start_time = time.time()
+    response = awarri_session().post(
+        tts_url,
+        headers=awarri_headers()['tts'],
+        json=payload,
+        timeout=AWARRI_TIMEOUT
+    )
+    latency = time.time() - start_time
 
-        if response.status_code != 200:
-            st.error("Awarri TTS request failed")
-            st.code(
-                f"Status: {response.status_code}\nResponse: {response.text}",
-                language="text"
-            )
-            return None, latency
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(response=response)
 
-        audio_bytes = response.content
-        audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
+    write_tts_cache(text, tts_url, response.content)
+    return response.content, latency, False
 
-        return audio_base64, latency
+def generate_awarri_audio(text: str, use_cache: bool = True):
+    """
+    Generate audio using the new Awarri TTS endpoint.
+    Uses returnFormat='audio' (raw WAV bytes).
+    Returns (audio_bytes, latency, from_cache)
+    """
+    config = get_config()
+    if not config.tts_url or not config.tts_api_key:
+        st.error("Awarri API credentials not configured")
+        return None, 0.0, False
+
+    try:
+        return request_awarri_audio(text, use_cache)
+
+    except requests.exceptions.HTTPError as e:
+        st.error("Awarri TTS request failed")
+        st.code(
+            f"Status: {e.response.status_code}\nResponse: {e.response.text}",
+            language="text"
+        )
+        return None, 0.0, False
 
     except requests.exceptions.RequestException as e:
         st.error("Awarri TTS network error")
         st.code(str(e), language="text")
-        return None, 0.0
+        return None, 0.0, False
 
+AUDIO_FILE_PATTERN = re.compile(r'Hausa_(short|medium|long)_audio(\d+)\.wav')
+
+@st.cache_data(ttl=600, show_spinner=False)
 def get_audio_files():
     """Get all audio files from the hausa_audio folder"""
     audio_folder = "hausa_audio"
     
-    audio_files = {
+    found = {
         'short': [],
         'medium': [],
         'long': []
     }
     
-    if os.path.exists(audio_folder):
-        for i in range(1, 6):
-            file_path = os.path.join(audio_folder, f"Hausa_short_audio{i}.wav")
-            if os.path.exists(file_path):
-                audio_files['short'].append(file_path)
-        
-        for i in range(1, 5):
-            file_path = os.path.join(audio_folder, f"Hausa_medium_audio{i}.wav")
-            if os.path.exists(file_path):
-                audio_files['medium'].append(file_path)
-        
-        for i in range(1, 5):
-            file_path = os.path.join(audio_folder, f"Hausa_long_audio{i}.wav")
-            if os.path.exists(file_path):
-                audio_files['long'].append(file_path)
+    if os.path.isdir(audio_folder):
+        with os.scandir(audio_folder) as entries:
+            for entry in entries:
+                match = AUDIO_FILE_PATTERN.fullmatch(entry.name)
+                if match:
+                    found[match.group(1)].append((int(match.group(2)), entry.path))
     
-    return audio_files
+    return {category: [path for _, path in sorted(files)] for category, files in found.items()}
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def read_audio(path: str, mtime: float) -> bytes:
+    """Read an audio file once per modification time and hand the same bytes to every rerun"""
+    with open(path, 'rb') as f:
+        return f.read()
 
 # Text data for reference
 TEXTS = {
@@ -246,6 +478,112 @@ TEXTS = {
     ]
 }
 
+# (category, section title, text box height) for each group of reference audios
+AUDIO_SECTIONS = (
+    ('short', "📝 Short Audios", 80),
+    ('medium', "📄 Medium Audios", 100),
+    ('long', "📋 Long Audios", 120)
+)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def build_audio_manifest():
+    """
+    Group the reference audios by section as (category, title, height, rows),
+    where each row is (idx, path, text).
+    """
+    audio_files = get_audio_files()
+    return tuple(
+        (
+            category,
+            title,
+            height,
+            tuple(
+                (idx, audio_path, text)
+                for idx, (audio_path, text) in enumerate(zip(audio_files[category], TEXTS[category]), 1)
+            )
+        )
+        for category, title, height in AUDIO_SECTIONS
+    )
+
+AUDIO_MANIFEST = build_audio_manifest()
+
+@st.fragment
+def render_audio_block(idx, audio_path, text, height, key_prefix):
+    """Render one reference audio next to its original text"""
+    st.markdown(f"**Audio {idx}**")
+    col1, col2 = st.columns([2, 3])
+    
+    with col1:
+        st.audio(read_audio(audio_path, os.path.getmtime(audio_path)), format="audio/wav")
+    
+    with col2:
+        st.text_area(f"Original Text", text, height=height, key=f"{key_prefix}_{idx}", disabled=True)
+    
+    st.markdown("---")
+
+DEFAULT_SCORE = 5
+
+@st.fragment
+def render_scoring(user_name):
+    """Render the overall scoring inputs and submit button"""
+    # Inputs are buffered client-side until the form is submitted
+    with st.form("eval_form"):
+        # Overall evaluation section
+        st.subheader("📝 Overall Evaluation")
+        st.markdown("**After listening to all audios above, provide your overall scores:**")
+        
+        cols = st.columns(4)
+        with cols[0]:
+            naturalness = st.number_input("Naturalness (1-10)", 1, 10, DEFAULT_SCORE, key="overall_naturalness")
+        with cols[1]:
+            accuracy = st.number_input("Accuracy (1-10)", 1, 10, DEFAULT_SCORE, key="overall_accuracy")
+        with cols[2]:
+            numbers = st.number_input("Numbers (1-10)", 1, 10, DEFAULT_SCORE, key="overall_numbers")
+        with cols[3]:
+            mtn = st.number_input("MTN Lingo (1-10)", 1, 10, DEFAULT_SCORE, key="overall_mtn")
+        
+        # Overall comment
+        st.subheader("💬 Overall Comment")
+        overall_comment = st.text_area("Add any additional comments about your evaluation", height=150, key="overall_comment")
+        
+        # Submit button
+        submitted = st.form_submit_button("📤 Submit Evaluation", type="primary")
+    
+    if submitted:
+        scores = (naturalness, accuracy, numbers, mtn)
+        if not user_name:
+            st.error("❌ Please enter your name before submitting.")
+        elif all(score == DEFAULT_SCORE for score in scores) and not overall_comment.strip():
+            st.warning("⚠️ Please adjust at least one score or add a comment before submitting.")
+        else:
+            # Prepare data
+            data = {
+                'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'User Name': user_name,
+                'Naturalness Score': naturalness,
+                'Accuracy Score': accuracy,
+                'Pronouncing Numbers Score': numbers,
+                'Pronouncing MTN Lingo Score': mtn,
+                'Overall Comment': overall_comment
+            }
+            
+            # Fingerprint everything except the timestamp to skip repeat submissions
+            submit_hash = blake2b(
+                orjson.dumps({k: v for k, v in data.items() if k != 'Timestamp'}),
+                digest_size=8
+            ).digest()
+            if st.session_state.get('_last_submit') == submit_hash:
+                st.info("ℹ️ No changes to submit.")
+            else:
+                with st.spinner("Saving evaluation to Google Sheets..."):
+                    # Save to Google Sheets
+                    if save_to_google_sheets(data):
+                        st.session_state['_last_submit'] = submit_hash
+                        st.success("✅ Evaluation submitted successfully to Google Sheets!")
+                        st.balloons()
+                    else:
+                        st.error("❌ Failed to save evaluation. Please try again.")
+
 # Streamlit App
 st.set_page_config(page_title="TTS Model Testing", layout="wide")
 
@@ -278,100 +616,18 @@ with tab1:
     if not user_name:
         st.warning("⚠️ Please enter your name to begin evaluation.")
     else:
-        audio_files = get_audio_files()
-        
-        if not any(audio_files.values()):
+        if not any(rows for _, _, _, rows in AUDIO_MANIFEST):
             st.error("❌ No audio files found in 'hausa_audio' folder. Please ensure audio files are present.")
         else:
             st.success(f"👤 Evaluator: **{user_name}**")
             st.info("👂 Listen to all audios below, then provide your overall evaluation at the bottom.")
             
-            # Short audios
-            st.subheader("📝 Short Audios")
-            for idx, (audio_path, text) in enumerate(zip(audio_files['short'], TEXTS['short']), 1):
-                with st.container():
-                    st.markdown(f"**Audio {idx}**")
-                    col1, col2 = st.columns([2, 3])
-                    
-                    with col1:
-                        st.audio(audio_path)
-                    
-                    with col2:
-                        st.text_area(f"Original Text", text, height=80, key=f"text_short_{idx}", disabled=True)
-                    
-                    st.divider()
-            
-            # Medium audios
-            st.subheader("📄 Medium Audios")
-            for idx, (audio_path, text) in enumerate(zip(audio_files['medium'], TEXTS['medium']), 1):
-                with st.container():
-                    st.markdown(f"**Audio {idx}**")
-                    col1, col2 = st.columns([2, 3])
-                    
-                    with col1:
-                        st.audio(audio_path)
-                    
-                    with col2:
-                        st.text_area(f"Original Text", text, height=100, key=f"text_medium_{idx}", disabled=True)
-                    
-                    st.divider()
-            
-            # Long audios
-            st.subheader("📋 Long Audios")
-            for idx, (audio_path, text) in enumerate(zip(audio_files['long'], TEXTS['long']), 1):
-                with st.container():
-                    st.markdown(f"**Audio {idx}**")
-                    col1, col2 = st.columns([2, 3])
-                    
-                    with col1:
-                        st.audio(audio_path)
-                    
-                    with col2:
-                        st.text_area(f"Original Text", text, height=120, key=f"text_long_{idx}", disabled=True)
-                    
-                    st.divider()
+            for category, title, height, rows in AUDIO_MANIFEST:
+                st.subheader(title)
+                for idx, audio_path, text in rows:
+                    render_audio_block(idx, audio_path, text, height, f"text_{category}")
             
-            # Overall evaluation section
-            st.subheader("📝 Overall Evaluation")
-            st.markdown("**After listening to all audios above, provide your overall scores:**")
-            
-            cols = st.columns(4)
-            with cols[0]:
-                naturalness = st.number_input("Naturalness (1-10)", 1, 10, 5, key="overall_naturalness")
-            with cols[1]:
-                accuracy = st.number_input("Accuracy (1-10)", 1, 10, 5, key="overall_accuracy")
-            with cols[2]:
-                numbers = st.number_input("Numbers (1-10)", 1, 10, 5, key="overall_numbers")
-            with cols[3]:
-                mtn = st.number_input("MTN Lingo (1-10)", 1, 10, 5, key="overall_mtn")
-            
-            # Overall comment
-            st.subheader("💬 Overall Comment")
-            overall_comment = st.text_area("Add any additional comments about your evaluation", height=150, key="overall_comment")
-            
-            # Submit button
-            if st.button("📤 Submit Evaluation", type="primary"):
-                if user_name:
-                    with st.spinner("Saving evaluation to Google Sheets..."):
-                        # Prepare data
-                        data = {
-                            'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'User Name': user_name,
-                            'Naturalness Score': naturalness,
-                            'Accuracy Score': accuracy,
-                            'Pronouncing Numbers Score': numbers,
-                            'Pronouncing MTN Lingo Score': mtn,
-                            'Overall Comment': overall_comment
-                        }
-                        
-                        # Save to Google Sheets
-                        if save_to_google_sheets(data):
-                            st.success("✅ Evaluation submitted successfully to Google Sheets!")
-                            st.balloons()
-                        else:
-                            st.error("❌ Failed to save evaluation. Please try again.")
-                else:
-                    st.error("❌ Please enter your name before submitting.")
+            render_scoring(user_name)
 
 # Tab 2: Live Test
 with tab2:
@@ -386,18 +642,24 @@ with tab2:
         placeholder="Type your Hausa text here...",
         key="tts_text_input"
     )
+    bypass_tts_cache = st.checkbox(
+        "Bypass audio cache (always call the TTS model)",
+        key="bypass_tts_cache"
+    )
     
     if st.button("🎵 Generate Audio", type="primary"):
         if not text_input.strip():
             st.warning("⚠️ Please enter text before generating")
         else:
             with st.spinner("Generating audio with Awarri TTS..."):
-                audio_base64, latency = generate_awarri_audio(text_input)
-                if audio_base64:
-                    st.success(f"✅ Audio generated in {latency:.2f}s")
+                audio_bytes, latency, from_cache = generate_awarri_audio(text_input, use_cache=not bypass_tts_cache)
+                if audio_bytes:
+                    if from_cache:
+                        st.success("✅ Loaded cached audio (no TTS request made)")
+                    else:
+                        st.success(f"✅ Audio generated in {latency:.2f}s")
                     
                     # Display the generated audio
-                    audio_bytes = base64.b64decode(audio_base64)
                     st.audio(audio_bytes, format="audio/wav")
                     
                     # Store in session state for transcription testing
@@ -416,7 +678,9 @@ with tab2:
         
         if st.button("📝 Transcribe Audio", type="primary"):
             with st.spinner("Transcribing..."):
-                result = transcribe_with_awarri_new(audio_bytes.getvalue(), language)
+                partial_transcript = st.empty()
+                result = transcribe_streaming(audio_bytes.getvalue(), language, partial_transcript.write)
+                partial_transcript.empty()
                 
                 if result['status'] == 'success':
                     st.success("✅ Transcription Complete!")
@@ -430,4 +694,25 @@ with tab2:
                     st.subheader("Transcription:")
                     st.write(result['transcription'])
                 else:
-                    st.error(f"❌ Transcription Failed: {result['transcription']}")
+                    st.error(f"❌ Transcription Failed: {result['error']}")
+    
+    st.divider()
+    
+    # Batch transcription of the reference audios
+    st.subheader("📚 Transcribe Reference Audios")
+    if st.button("📝 Transcribe All", key="transcribe_all"):
+        audio_paths = [audio_path for _, _, _, rows in AUDIO_MANIFEST for _, audio_path, _ in rows]
+        
+        if not audio_paths:
+            st.error("❌ No audio files found in 'hausa_audio' folder. Please ensure audio files are present.")
+        else:
+            with st.spinner(f"Transcribing {len(audio_paths)} audios..."):
+                results = transcribe_batch([(read_audio(path, os.path.getmtime(path)), "Hausa") for path in audio_paths])
+            
+            for audio_path, result in zip(audio_paths, results):
+                audio_name = os.path.basename(audio_path)
+                if result['status'] == 'success':
+                    st.markdown(f"**{audio_name}** ({result['latency']} seconds)")
+                    st.write(result['transcription'])
+                else:
+                    st.error(f"❌ {audio_name}: {result['error']}")
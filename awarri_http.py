@@ -0,0 +1,25 @@
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry policy for Awarri POSTs, shared by app.py and data_generation.py
+AWARRI_RETRY = Retry(
+    total=3,
+    connect=3,
+    # Never resend a POST whose response timed out: it may still be billed
+    read=0,
+    status=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["POST"]),
+    respect_retry_after_header=True,
+    # Hand the final 429/5xx response back so its status and body are reported
+    raise_on_status=False
+)
+
+def make_awarri_adapter(pool_connections: int, pool_maxsize: int) -> HTTPAdapter:
+    """Pooled HTTPS adapter carrying the Awarri retry policy"""
+    return HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=AWARRI_RETRY
+    )
@@ -1,16 +1,24 @@
+import argparse
 import os
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
+from awarri_http import make_awarri_adapter
+from tts_cache import copy_from_tts_cache, copy_into_tts_cache
 
 load_dotenv()
 
 # ==============================
 # CONFIG
 # ==============================
-TTS_URL = os.getenv("AWARRI_TTS_URL")  # same as Streamlit
-API_KEY = os.getenv("AWARRI_API_KEY")
+# Fail at startup rather than mid-batch if either setting is missing
+TTS_URL = os.environ["AWARRI_TTS_URL"]  # same as Streamlit
+API_KEY = os.environ["AWARRI_API_KEY"]
+
+# (connect, read) seconds
+TIMEOUT = (5, 55)
 
 OUTPUT_DIR = Path("hausa_audio")
 OUTPUT_DIR.mkdir(exist_ok=True)
@@ -21,6 +29,11 @@ HEADERS = {
     "Accept": "audio/wav"
 }
 
+# Shared session so every TTS call reuses pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", make_awarri_adapter(pool_connections=4, pool_maxsize=16))
+SESSION.headers.update(HEADERS)
+
 # ==============================
 # HAUSA TEXT DATA
 # ==============================
@@ -49,44 +62,66 @@ TEXTS = {
 # ==============================
 # TTS FUNCTION (EXACT MATCH)
 # ==============================
-def synthesize_awarri_tts(text: str) -> bytes:
+def synthesize_awarri_tts(text: str, output_path: Path, use_cache: bool = True) -> bool:
+    """Write the WAV for text to output_path; returns True when it came from the cache"""
+    if use_cache and copy_from_tts_cache(text, TTS_URL, output_path):
+        return True
+
     payload = {
         "text": text,
         "language": "Hausa",
         "returnFormat": "audio"
     }
 
-    response = requests.post(
+    with SESSION.post(
         TTS_URL,
-        headers=HEADERS,
         json=payload,
-        timeout=60
-    )
+        timeout=TIMEOUT,
+        stream=True
+    ) as response:
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Awarri TTS failed ({response.status_code}): {response.text}"
+            )
 
-    if response.status_code != 200:
-        raise RuntimeError(
-            f"Awarri TTS failed ({response.status_code}): {response.text}"
-        )
+        # 🔑 RAW WAV BYTES, streamed to a temp file so failures never leave a partial WAV
+        partial_path = output_path.with_suffix(".part")
+        with open(partial_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+        partial_path.replace(output_path)
 
-    return response.content  # 🔑 RAW WAV BYTES
+    copy_into_tts_cache(text, TTS_URL, output_path)
+    return False
 
 # ==============================
 # MAIN LOOP
 # ==============================
-def run_batch_tts():
-    for category, texts in TEXTS.items():
-        for idx, text in enumerate(texts, start=1):
-            filename = f"Hausa_{category}_audio{idx}.wav"
-            output_path = OUTPUT_DIR / filename
+def synthesize_to_file(category: str, idx: int, text: str, use_cache: bool) -> tuple:
+    filename = f"Hausa_{category}_audio{idx}.wav"
+    output_path = OUTPUT_DIR / filename
 
-            print(f"Generating: {filename}")
-            start = time.time()
+    start = time.time()
+    from_cache = synthesize_awarri_tts(text, output_path, use_cache)
 
-            audio_bytes = synthesize_awarri_tts(text)
-            with open(output_path, "wb") as f:
-                f.write(audio_bytes)
+    return filename, time.time() - start, from_cache
 
-            print(f"Saved ({time.time() - start:.2f}s)")
+def run_batch_tts(max_workers: int = 8, use_cache: bool = True):
+    jobs = [
+        (category, idx, text)
+        for category, texts in TEXTS.items()
+        for idx, text in enumerate(texts, start=1)
+    ]
+    print(f"Generating {len(jobs)} audio files with {max_workers} workers")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(synthesize_to_file, *job, use_cache) for job in jobs]
+        for future in as_completed(futures):
+            filename, elapsed, from_cache = future.result()
+            if from_cache:
+                print(f"Copied {filename} from cache")
+            else:
+                print(f"Saved {filename} ({elapsed:.2f}s)")
 
     print("\n✅ All Hausa audio files generated successfully.")
 
@@ -94,4 +129,11 @@ def run_batch_tts():
 # ENTRY POINT
 # ==============================
 if __name__ == "__main__":
-    run_batch_tts()
+    parser = argparse.ArgumentParser(description="Generate the Hausa reference audios with Awarri TTS")
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="ignore cached audio and re-synthesize every file, e.g. after a model update"
+    )
+    args = parser.parse_args()
+    run_batch_tts(use_cache=not args.refresh_cache)
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# On-disk cache of synthesized WAVs, shared by app.py and data_generation.py
+TTS_CACHE_DIR = Path(".tts_cache")
+# Entries expire so a model update behind the same URL is eventually picked up
+TTS_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+# Oldest entries are pruned beyond this count so arbitrary input cannot fill the disk
+TTS_CACHE_MAX_ENTRIES = 256
+
+def tts_cache_path(text: str, endpoint: str, language: str = "Hausa") -> Path:
+    """Path of the cached WAV for a (TTS endpoint, language, text) triple"""
+    # Keying on the endpoint keeps audio from different model deployments apart
+    digest = hashlib.sha256(f"{endpoint}|{language}|{text}".encode("utf-8")).hexdigest()
+    return TTS_CACHE_DIR / f"{digest}.wav"
+
+def is_wav(header: bytes) -> bool:
+    """True when the first 12 bytes look like a RIFF/WAVE file"""
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+def fresh_tts_cache_path(text: str, endpoint: str, language: str = "Hausa") -> Path | None:
+    """Path of the cached WAV if it exists and has not expired, else None"""
+    cache_path = tts_cache_path(text, endpoint, language)
+    try:
+        if time.time() - cache_path.stat().st_mtime < TTS_CACHE_MAX_AGE:
+            return cache_path
+    except OSError:
+        pass
+    return None
+
+def read_tts_cache(text: str, endpoint: str, language: str = "Hausa") -> bytes | None:
+    """Cached audio for text, or None on a miss, expiry or unreadable cache"""
+    cache_path = fresh_tts_cache_path(text, endpoint, language)
+    if cache_path is None:
+        return None
+    try:
+        return cache_path.read_bytes()
+    except OSError:
+        return None
+
+def copy_from_tts_cache(text: str, endpoint: str, output_path: Path, language: str = "Hausa") -> bool:
+    """Copy a fresh cached WAV to output_path via a temp file and rename; False on a miss"""
+    cache_path = fresh_tts_cache_path(text, endpoint, language)
+    if cache_path is None:
+        return False
+    partial_path = output_path.with_suffix(".part")
+    try:
+        shutil.copyfile(cache_path, partial_path)
+        partial_path.replace(output_path)
+        return True
+    except OSError:
+        # Unreadable cache or interrupted copy; never leave a truncated WAV behind
+        partial_path.unlink(missing_ok=True)
+        return False
+
+def _prune_cache() -> None:
+    """Drop the oldest entries once the cache holds more than TTS_CACHE_MAX_ENTRIES"""
+    with os.scandir(TTS_CACHE_DIR) as entries:
+        cached = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith(".wav")]
+    cached.sort()
+    for _, path in cached[:-TTS_CACHE_MAX_ENTRIES]:
+        Path(path).unlink(missing_ok=True)
+
+def _store_in_cache(cache_path: Path, write) -> None:
+    """Write via a uniquely named temp file and rename into place; errors are swallowed"""
+    temp_path = None
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".part", delete=False) as f:
+            temp_path = Path(f.name)
+            write(f)
+        temp_path.replace(cache_path)
+        _prune_cache()
+    except OSError:
+        # The cache is only an optimisation; a read-only or full disk must not fail synthesis
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
+
+def write_tts_cache(text: str, endpoint: str, audio_bytes: bytes, language: str = "Hausa") -> None:
+    """Best-effort store of synthesized audio; non-WAV bodies are never cached"""
+    if not is_wav(audio_bytes[:12]):
+        return
+    _store_in_cache(tts_cache_path(text, endpoint, language), lambda f: f.write(audio_bytes))
+
+def copy_into_tts_cache(text: str, endpoint: str, source_path: Path, language: str = "Hausa") -> None:
+    """Best-effort store of an already-written WAV without loading it into memory"""
+    try:
+        with open(source_path, "rb") as source:
+            if not is_wav(source.read(12)):
+                return
+    except OSError:
+        return
+
+    def copy(f):
+        with open(source_path, "rb") as source:
+            shutil.copyfileobj(source, f)
+
+    _store_in_cache(tts_cache_path(text, endpoint, language), copy)